@@ -0,0 +1,56 @@
+"""One-off migration: convert legacy ISO-string timestamps to BSON dates.
+
+Run once per database after deploying native datetime storage:
+
+    cd backend && python migrate_timestamps.py
+
+Values that don't parse as ISO 8601 are logged and left untouched. Safe to
+re-run; only string-typed fields are touched.
+"""
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+
+from dotenv import load_dotenv
+from pymongo import MongoClient, UpdateOne
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+# Timestamp fields that older documents stored as ISO strings
+DATETIME_FIELDS = {
+    "users": ("created_at",),
+    "issues": ("created_at", "sla_deadline"),
+    "issue_updates": ("timestamp",),
+}
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def migrate_iso_timestamps(db) -> None:
+    """Convert string timestamps to dates, skipping values that don't parse"""
+    for collection_name, fields in DATETIME_FIELDS.items():
+        collection = db[collection_name]
+        for field in fields:
+            ops = []
+            for doc in collection.find({field: {"$type": "string"}}, {field: 1}):
+                try:
+                    value = datetime.fromisoformat(doc[field])
+                except ValueError:
+                    logger.warning(f"Skipping {collection_name} {doc['_id']}: unparsable {field} {doc[field]!r}")
+                    continue
+                ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {field: value}}))
+            if ops:
+                collection.bulk_write(ops, ordered=False)
+            logger.info(f"Converted {len(ops)} {collection_name}.{field} values to dates")
+
+if __name__ == "__main__":
+    client = MongoClient(os.environ['MONGO_URL'])
+    try:
+        migrate_iso_timestamps(client[os.environ['DB_NAME']])
+    finally:
+        client.close()
@@ -0,0 +1,39 @@
+"""Password hashing helpers.
+
+Kept apart from server.py so the hash pool's worker processes only import
+this module, not the app, its Mongo client or its caches.
+"""
+import os
+from functools import lru_cache
+
+import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+
+@lru_cache(maxsize=1)
+def get_password_hasher() -> PasswordHasher:
+    """Argon2id hasher; tune the env costs so one hash takes roughly 50-100ms on the host"""
+    return PasswordHasher(
+        time_cost=int(os.environ.get('ARGON2_TIME_COST', '2')),
+        memory_cost=int(os.environ.get('ARGON2_MEMORY_COST', '19456')),
+        parallelism=1
+    )
+
+def hash_password_sync(password: str) -> str:
+    """Hash password using Argon2id"""
+    return get_password_hasher().hash(password)
+
+def verify_password_sync(password: str, hashed: str) -> bool:
+    """Verify against an Argon2id hash, falling back to legacy bcrypt hashes"""
+    if hashed.startswith("$argon2"):
+        try:
+            return get_password_hasher().verify(hashed, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    return bcrypt.checkpw(password.encode(), hashed.encode())
+
+def password_needs_rehash(hashed: str) -> bool:
+    """Check if a stored hash is legacy bcrypt or uses outdated Argon2 parameters"""
+    if not hashed.startswith("$argon2"):
+        return True
+    return get_password_hasher().check_needs_rehash(hashed)
@@ -1,43 +1,79 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File, Form, Request
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File, Form, Request, Query, BackgroundTasks
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer
 from fastapi.security.http import HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from pymongo.errors import AutoReconnect, DuplicateKeyError, NetworkTimeout, ServerSelectionTimeoutError
+from pymongo.write_concern import WriteConcern
 import os
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
 import uuid
 from datetime import datetime, timezone, timedelta
 import hashlib
-import bcrypt
+from functools import lru_cache
+import re
 import jwt
+from cachetools import TTLCache
 from emergentintegrations.llm.chat import LlmChat, UserMessage
-import json
+from passwords import hash_password_sync, password_needs_rehash, verify_password_sync
+import orjson
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=100,
+    minPoolSize=10,
+    maxIdleTimeMS=60000,
+    serverSelectionTimeoutMS=3000,
+    waitQueueTimeoutMS=2000,
+    compressors="zstd,zlib",
+    tz_aware=True
+)
 db = client[os.environ['DB_NAME']]
 
 # Environment variables
 JWT_SECRET = os.environ['JWT_SECRET']
+JWT_ALGORITHM = "HS256"
 EMERGENT_LLM_KEY = os.environ.get('EMERGENT_LLM_KEY')
 FILE_UPLOAD_PATH = os.environ.get('FILE_UPLOAD_PATH', '/app/backend/uploads')
+# Attempts for the post-response issue insert before giving up
+ISSUE_INSERT_ATTEMPTS = 3
+# Explicit origins; browsers reject a "*" origin on credentialed requests
+CORS_ORIGINS = [o.strip() for o in os.environ.get('CORS_ORIGINS', 'http://localhost:3000').split(',') if o.strip()]
+# Worker processes for password hashing, per API worker (Argon2 cost params live in passwords.py).
+# Each uvicorn worker starts its own pool, so by default the cores are split across them.
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', '1'))
+HASH_WORKERS = int(os.environ.get('HASH_WORKERS', str(max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY))))
 
 # Ensure upload directory exists
 Path(FILE_UPLOAD_PATH).mkdir(parents=True, exist_ok=True)
 
 # Create the main app
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 security = HTTPBearer()
 
+# Verified tokens -> (payload, user) for a short window, skips decode + user lookup
+auth_cache = TTLCache(maxsize=10000, ttl=30)
+# Normalized feedback text digest -> Gemini moderation result
+moderation_cache = TTLCache(maxsize=5000, ttl=3600)
+# Created on startup; spawn so workers don't inherit the loop and Mongo threads
+hash_pool: Optional[ProcessPoolExecutor] = None
+
 # ============= MODELS =============
 
 class UserCreate(BaseModel):
@@ -58,7 +94,19 @@ class User(BaseModel):
     name: str
     role: str
     department: Optional[str] = None
-    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class UserPublic(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    uid: str
+    email: str
+    name: str
+    role: str
+    department: Optional[str] = None
+
+class AuthResponse(BaseModel):
+    token: str
+    user: UserPublic
 
 class FeedbackSubmit(BaseModel):
     category: str
@@ -75,8 +123,8 @@ class Issue(BaseModel):
     urgency_score: int = 0
     assigned_role: str
     frequency_count: int = 1
-    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
-    sla_deadline: str
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    sla_deadline: datetime
     anon_token: str
     evidence_urls: Optional[List[str]] = []
 
@@ -88,7 +136,7 @@ class IssueUpdate(BaseModel):
     content_type: str
     content_text: Optional[str] = None
     content_url: Optional[str] = None
-    timestamp: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class UpdateCreate(BaseModel):
     content_type: str
@@ -102,64 +150,84 @@ class StatusUpdate(BaseModel):
 
 # ============= HELPER FUNCTIONS =============
 
-def generate_anon_token(uid: str) -> str:
-    """Generate anonymous token from user ID"""
-    salt = datetime.now(timezone.utc).strftime("%Y%m%d")
+@lru_cache(maxsize=8192)
+def _anon_token_for_day(uid: str, salt: str) -> str:
+    """Hash user ID with the daily salt (pure, so safe to memoize)"""
     return hashlib.sha256(f"{uid}{salt}".encode()).hexdigest()[:12]
 
-def hash_password(password: str) -> str:
-    """Hash password using bcrypt"""
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+def generate_anon_token(uid: str, now: Optional[datetime] = None) -> str:
+    """Generate anonymous token from user ID"""
+    salt = (now or datetime.now(timezone.utc)).strftime("%Y%m%d")
+    return _anon_token_for_day(uid, salt)
+
+async def hash_password(password: str) -> str:
+    """Hash password using Argon2id in the hash worker pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(hash_pool, hash_password_sync, password)
 
-def verify_password(password: str, hashed: str) -> bool:
-    """Verify password against hash"""
-    return bcrypt.checkpw(password.encode(), hashed.encode())
+async def verify_password(password: str, hashed: str) -> bool:
+    """Verify password against hash in the hash worker pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(hash_pool, verify_password_sync, password, hashed)
 
-def create_jwt_token(uid: str) -> str:
+def create_jwt_token(uid: str, now: Optional[datetime] = None) -> str:
     """Create JWT token for user"""
     payload = {
         "uid": uid,
-        "exp": datetime.now(timezone.utc) + timedelta(days=7)
+        "exp": (now or datetime.now(timezone.utc)) + timedelta(days=7)
     }
-    return jwt.encode(payload, JWT_SECRET, algorithm="HS256")
+    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 def decode_jwt_token(token: str) -> dict:
     """Decode JWT token"""
     try:
-        return jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
-    except:
+        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+    except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Get current user from JWT token"""
+    cache_key = hashlib.sha256(credentials.credentials.encode()).hexdigest()[:32]
+    cached = auth_cache.get(cache_key)
+    if cached and cached[0]["exp"] > datetime.now(timezone.utc).timestamp():
+        return cached[1]
+    
     payload = decode_jwt_token(credentials.credentials)
     user = await db.users.find_one({"uid": payload["uid"]}, {"_id": 0})
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
+    auth_cache[cache_key] = (payload, user)
     return user
 
-def get_role_hierarchy(category: str) -> List[str]:
+DEFAULT_HIERARCHY = ("Staff", "Admin", "Principal")
+
+ROLE_HIERARCHIES = MappingProxyType({
+    "Academics": ("Staff", "HoD", "Admin", "Principal"),
+    "Hostel": ("Warden", "Admin", "Principal"),
+    "Infrastructure": ("Staff", "Admin", "Principal"),
+    "Food": ("Staff", "Admin", "Principal"),
+    "Transportation": ("Staff", "Admin", "Principal"),
+    "Other": ("Staff", "Admin", "Principal")
+})
+
+# Role -> position in each hierarchy, so escalation lookups avoid list.index scans
+_DEFAULT_HIERARCHY_INDEX = MappingProxyType({role: i for i, role in enumerate(DEFAULT_HIERARCHY)})
+ROLE_HIERARCHY_INDEX = MappingProxyType({
+    category: MappingProxyType({role: i for i, role in enumerate(roles)})
+    for category, roles in ROLE_HIERARCHIES.items()
+})
+
+def get_role_hierarchy(category: str) -> Tuple[str, ...]:
     """Get role hierarchy for a category"""
-    hierarchies = {
-        "Academics": ["Staff", "HoD", "Admin", "Principal"],
-        "Hostel": ["Warden", "Admin", "Principal"],
-        "Infrastructure": ["Staff", "Admin", "Principal"],
-        "Food": ["Staff", "Admin", "Principal"],
-        "Transportation": ["Staff", "Admin", "Principal"],
-        "Other": ["Staff", "Admin", "Principal"]
-    }
-    return hierarchies.get(category, ["Staff", "Admin", "Principal"])
+    return ROLE_HIERARCHIES.get(category, DEFAULT_HIERARCHY)
 
-async def moderate_with_gemini(text: str) -> dict:
-    """Moderate text using Gemini API"""
-    try:
-        chat = LlmChat(
-            api_key=EMERGENT_LLM_KEY,
-            session_id=str(uuid.uuid4()),
-            system_message="You are a moderation assistant. Check feedback for abuse, threats, or inappropriate content. Rewrite in neutral professional tone. Provide urgency score 0-100."
-        ).with_model("gemini", "gemini-3-flash-preview")
-        
-        prompt = f"""Analyze this student feedback:
+def get_role_hierarchy_index(category: str) -> Dict[str, int]:
+    """Get role -> position mapping for a category's hierarchy"""
+    return ROLE_HIERARCHY_INDEX.get(category, _DEFAULT_HIERARCHY_INDEX)
+
+MODERATION_SYSTEM_MESSAGE = "You are a moderation assistant. Check feedback for abuse, threats, or inappropriate content. Rewrite in neutral professional tone. Provide urgency score 0-100."
+
+MODERATION_PROMPT = """Analyze this student feedback:
 
 Text: "{text}"
 
@@ -170,11 +238,29 @@ Provide JSON response with:
 4. summary: brief 10-word summary
 
 Respond ONLY with valid JSON."""
-        
-        message = UserMessage(text=prompt)
+
+def new_moderation_chat() -> LlmChat:
+    """Create a moderation chat with its own session so feedback history is never shared"""
+    return LlmChat(
+        api_key=EMERGENT_LLM_KEY,
+        session_id=str(uuid.uuid4()),
+        system_message=MODERATION_SYSTEM_MESSAGE
+    ).with_model("gemini", "gemini-3-flash-preview")
+
+async def moderate_with_gemini(text: str) -> dict:
+    """Moderate text using Gemini API"""
+    cache_key = hashlib.blake2b(text.strip().lower().encode(), digest_size=16).digest()
+    cached = moderation_cache.get(cache_key)
+    if cached:
+        return cached
+    
+    try:
+        chat = new_moderation_chat()
+        message = UserMessage(text=MODERATION_PROMPT.format(text=text))
         response = await chat.send_message(message)
         
-        result = json.loads(response)
+        result = orjson.loads(response)
+        moderation_cache[cache_key] = result
         return result
     except Exception as e:
         logging.error(f"Gemini moderation error: {e}")
@@ -185,76 +271,91 @@ Respond ONLY with valid JSON."""
             "summary": text[:100]
         }
 
+async def insert_issue(issue_dict: dict):
+    """Write a new issue after the response is sent, retrying transient errors since nobody awaits it"""
+    issues = db.issues.with_options(write_concern=WriteConcern(w=1))
+    for attempt in range(ISSUE_INSERT_ATTEMPTS):
+        try:
+            await issues.insert_one(issue_dict)
+            return
+        except DuplicateKeyError:
+            # An earlier attempt reached the server before its connection dropped
+            return
+        except (AutoReconnect, NetworkTimeout, ServerSelectionTimeoutError) as e:
+            if attempt == ISSUE_INSERT_ATTEMPTS - 1:
+                error = e
+                break
+            await asyncio.sleep(0.5 * 2 ** attempt)
+        except Exception as e:
+            error = e
+            break
+    
+    # Log the full document so the issue can be re-inserted by hand
+    payload = orjson.dumps({k: v for k, v in issue_dict.items() if k != "_id"}).decode()
+    logging.error(f"Failed to insert issue {issue_dict['issue_id']}: {error}; payload: {payload}")
+
 # ============= ROUTES =============
 
-@api_router.post("/auth/register")
+# Fields left out of issue lists; full documents come from /issues/{issue_id}
+ISSUE_LIST_PROJECTION = {"_id": 0, "anon_token": 0, "evidence_urls": 0}
+
+@api_router.post("/auth/register", response_model=AuthResponse)
 async def register(user_data: UserCreate):
     """Register new user"""
     existing = await db.users.find_one({"email": user_data.email}, {"_id": 0})
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
     
+    now = datetime.now(timezone.utc)
     user = User(
         email=user_data.email,
         name=user_data.name,
         role=user_data.role,
-        department=user_data.department
+        department=user_data.department,
+        created_at=now
     )
     
     user_dict = user.model_dump()
-    user_dict["password"] = hash_password(user_data.password)
+    user_dict["password"] = await hash_password(user_data.password)
     
     await db.users.insert_one(user_dict)
     
-    token = create_jwt_token(user.uid)
+    token = create_jwt_token(user.uid, now)
     
-    return {
-        "token": token,
-        "user": {
-            "uid": user.uid,
-            "email": user.email,
-            "name": user.name,
-            "role": user.role,
-            "department": user.department
-        }
-    }
+    return {"token": token, "user": user}
 
-@api_router.post("/auth/login")
+@api_router.post("/auth/login", response_model=AuthResponse)
 async def login(credentials: UserLogin):
     """Login user"""
     user = await db.users.find_one({"email": credentials.email}, {"_id": 0})
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    if not verify_password(credentials.password, user["password"]):
+    if not await verify_password(credentials.password, user["password"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
+    # Upgrade legacy bcrypt hashes now that we have the plaintext
+    if password_needs_rehash(user["password"]):
+        await db.users.update_one(
+            {"uid": user["uid"]},
+            {"$set": {"password": await hash_password(credentials.password)}}
+        )
+    
     token = create_jwt_token(user["uid"])
     
-    return {
-        "token": token,
-        "user": {
-            "uid": user["uid"],
-            "email": user["email"],
-            "name": user["name"],
-            "role": user["role"],
-            "department": user.get("department")
-        }
-    }
+    return {"token": token, "user": user}
 
-@api_router.get("/auth/me")
+@api_router.get("/auth/me", response_model=UserPublic)
 async def get_me(current_user: dict = Depends(get_current_user)):
     """Get current user info"""
-    return {
-        "uid": current_user["uid"],
-        "email": current_user["email"],
-        "name": current_user["name"],
-        "role": current_user["role"],
-        "department": current_user.get("department")
-    }
+    return current_user
 
 @api_router.post("/feedback/submit")
-async def submit_feedback(feedback: FeedbackSubmit, current_user: dict = Depends(get_current_user)):
+async def submit_feedback(
+    feedback: FeedbackSubmit,
+    background_tasks: BackgroundTasks,
+    current_user: dict = Depends(get_current_user)
+):
     """Submit feedback (anonymous)"""
     if current_user["role"] != "Student":
         raise HTTPException(status_code=403, detail="Only students can submit feedback")
@@ -265,25 +366,26 @@ async def submit_feedback(feedback: FeedbackSubmit, current_user: dict = Depends
     if not moderation["is_appropriate"]:
         raise HTTPException(status_code=400, detail="Feedback contains inappropriate content")
     
-    # Check for similar issues
-    existing_issues = await db.issues.find(
-        {"category": feedback.category, "status": {"$ne": "Resolved"}},
-        {"_id": 0}
-    ).to_list(100)
+    # Bump frequency on a similar open issue, if any, in one round trip
+    existing = await db.issues.find_one_and_update(
+        {
+            "category": feedback.category,
+            "status": {"$ne": "Resolved"},
+            "summary": {"$regex": re.escape(moderation["summary"]), "$options": "i"}
+        },
+        {"$inc": {"frequency_count": 1}},
+        projection={"_id": 0, "issue_id": 1}
+    )
     
-    for existing in existing_issues:
-        if moderation["summary"].lower() in existing["summary"].lower():
-            await db.issues.update_one(
-                {"issue_id": existing["issue_id"]},
-                {"$inc": {"frequency_count": 1}}
-            )
-            return {"message": "Similar issue already reported", "issue_id": existing["issue_id"]}
+    if existing:
+        return {"message": "Similar issue already reported", "issue_id": existing["issue_id"]}
     
     # Create new issue
     hierarchy = get_role_hierarchy(feedback.category)
     assigned_role = hierarchy[0] if hierarchy else "Staff"
-    anon_token = generate_anon_token(current_user["uid"])
-    sla_deadline = (datetime.now(timezone.utc) + timedelta(days=2)).isoformat()
+    now = datetime.now(timezone.utc)
+    anon_token = generate_anon_token(current_user["uid"], now)
+    sla_deadline = now + timedelta(days=2)
     
     issue = Issue(
         category=feedback.category,
@@ -291,40 +393,49 @@ async def submit_feedback(feedback: FeedbackSubmit, current_user: dict = Depends
         original_text=feedback.text,
         urgency_score=moderation["urgency_score"],
         assigned_role=assigned_role,
+        created_at=now,
         sla_deadline=sla_deadline,
         anon_token=anon_token,
         evidence_urls=feedback.evidence_urls or []
     )
     
-    issue_dict = issue.model_dump()
-    await db.issues.insert_one(issue_dict)
+    # issue_id is generated here, so the response doesn't need to wait for the insert
+    background_tasks.add_task(insert_issue, issue.model_dump())
     
     return {"message": "Feedback submitted successfully", "issue_id": issue.issue_id}
 
 @api_router.get("/issues/my")
-async def get_my_issues(current_user: dict = Depends(get_current_user)):
+async def get_my_issues(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=1000),
+    current_user: dict = Depends(get_current_user)
+):
     """Get issues for current user role"""
     if current_user["role"] == "Student":
         anon_token = generate_anon_token(current_user["uid"])
-        issues = await db.issues.find(
-            {"anon_token": anon_token},
-            {"_id": 0, "anon_token": 0}
-        ).to_list(1000)
+        query = {"anon_token": anon_token}
     else:
         query = {"assigned_role": current_user["role"]}
         if current_user["role"] == "Principal":
             query = {"status": "Escalated"}
-        issues = await db.issues.find(query, {"_id": 0, "anon_token": 0}).to_list(1000)
+    
+    cursor = db.issues.find(query, ISSUE_LIST_PROJECTION).sort("created_at", -1).skip(skip).limit(limit)
+    issues = [issue async for issue in cursor]
     
     return {"issues": issues}
 
 @api_router.get("/issues/all")
-async def get_all_issues(current_user: dict = Depends(get_current_user)):
+async def get_all_issues(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=1000),
+    current_user: dict = Depends(get_current_user)
+):
     """Get all issues (Admin/Principal only)"""
     if current_user["role"] not in ["Admin", "Principal"]:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    issues = await db.issues.find({}, {"_id": 0, "anon_token": 0}).to_list(1000)
+    cursor = db.issues.find({}, ISSUE_LIST_PROJECTION).sort("created_at", -1).skip(skip).limit(limit)
+    issues = [issue async for issue in cursor]
     return {"issues": issues}
 
 @api_router.get("/issues/{issue_id}")
@@ -347,8 +458,11 @@ async def add_update(issue_id: str, update: UpdateCreate, current_user: dict = D
     if current_user["role"] == "Student":
         raise HTTPException(status_code=403, detail="Students cannot update issues")
     
-    issue = await db.issues.find_one({"issue_id": issue_id}, {"_id": 0})
-    if not issue:
+    result = await db.issues.update_one(
+        {"issue_id": issue_id},
+        {"$set": {"status": "In Progress"}}
+    )
+    if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Issue not found")
     
     issue_update = IssueUpdate(
@@ -357,12 +471,7 @@ async def add_update(issue_id: str, update: UpdateCreate, current_user: dict = D
         content_type=update.content_type,
         content_text=update.content_text
     )
-    
     await db.issue_updates.insert_one(issue_update.model_dump())
-    await db.issues.update_one(
-        {"issue_id": issue_id},
-        {"$set": {"status": "In Progress"}}
-    )
     
     return {"message": "Update added successfully"}
 
@@ -372,22 +481,25 @@ async def escalate_issue(issue_id: str, escalate_req: EscalateRequest, current_u
     if current_user["role"] == "Student":
         raise HTTPException(status_code=403, detail="Students cannot escalate issues")
     
-    issue = await db.issues.find_one({"issue_id": issue_id}, {"_id": 0})
+    issue = await db.issues.find_one({"issue_id": issue_id}, {"_id": 0, "category": 1, "assigned_role": 1})
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
     
     hierarchy = get_role_hierarchy(issue["category"])
-    current_index = hierarchy.index(issue["assigned_role"]) if issue["assigned_role"] in hierarchy else -1
+    current_index = get_role_hierarchy_index(issue["category"]).get(issue["assigned_role"], -1)
     
     if current_index >= len(hierarchy) - 1:
         raise HTTPException(status_code=400, detail="Already at highest level")
     
     next_role = hierarchy[current_index + 1]
     
-    await db.issues.update_one(
-        {"issue_id": issue_id},
+    # Only escalate from the role we read, so concurrent escalations can't skip a level
+    result = await db.issues.update_one(
+        {"issue_id": issue_id, "assigned_role": issue["assigned_role"]},
         {"$set": {"assigned_role": next_role, "status": "Escalated"}}
     )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=409, detail="Issue was reassigned, please retry")
     
     issue_update = IssueUpdate(
         issue_id=issue_id,
@@ -405,39 +517,41 @@ async def update_status(issue_id: str, status_update: StatusUpdate, current_user
     if current_user["role"] not in ["Admin", "Principal", "HoD", "Warden", "Staff"]:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    await db.issues.update_one(
+    result = await db.issues.update_one(
         {"issue_id": issue_id},
         {"$set": {"status": status_update.status}}
     )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Issue not found")
     
     return {"message": "Status updated successfully"}
 
 @api_router.get("/stats/dashboard")
 async def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
     """Get dashboard statistics"""
-    total_issues = await db.issues.count_documents({})
-    open_issues = await db.issues.count_documents({"status": "Open"})
-    in_progress = await db.issues.count_documents({"status": "In Progress"})
-    resolved = await db.issues.count_documents({"status": "Resolved"})
-    escalated = await db.issues.count_documents({"status": "Escalated"})
+    # All counts in one pass over issues
+    [stats] = await db.issues.aggregate([
+        {"$facet": {
+            "by_status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+            "by_category": [{"$group": {"_id": "$category", "count": {"$sum": 1}}}]
+        }}
+    ]).to_list(1)
     
-    categories = await db.issues.aggregate([
-        {"$group": {"_id": "$category", "count": {"$sum": 1}}}
-    ]).to_list(100)
+    status_counts = {row["_id"]: row["count"] for row in stats["by_status"]}
     
     return {
-        "total_issues": total_issues,
-        "open_issues": open_issues,
-        "in_progress": in_progress,
-        "resolved": resolved,
-        "escalated": escalated,
-        "categories": categories
+        "total_issues": sum(status_counts.values()),
+        "open_issues": status_counts.get("Open", 0),
+        "in_progress": status_counts.get("In Progress", 0),
+        "resolved": status_counts.get("Resolved", 0),
+        "escalated": status_counts.get("Escalated", 0),
+        "categories": stats["by_category"]
     }
 
 @api_router.post("/cron/check-escalation")
 async def check_escalation():
     """Check and auto-escalate issues past SLA"""
-    now = datetime.now(timezone.utc).isoformat()
+    now = datetime.now(timezone.utc)
     
     issues = await db.issues.find(
         {
@@ -447,36 +561,46 @@ async def check_escalation():
         {"_id": 0}
     ).to_list(1000)
     
-    escalated_count = 0
+    issue_ops = []
+    update_docs = []
+    hierarchies = {}
     for issue in issues:
-        hierarchy = get_role_hierarchy(issue["category"])
-        current_index = hierarchy.index(issue["assigned_role"]) if issue["assigned_role"] in hierarchy else -1
+        category = issue["category"]
+        if category not in hierarchies:
+            hierarchies[category] = (get_role_hierarchy(category), get_role_hierarchy_index(category))
+        hierarchy, hierarchy_index = hierarchies[category]
+        current_index = hierarchy_index.get(issue["assigned_role"], -1)
         
         if current_index < len(hierarchy) - 1:
             next_role = hierarchy[current_index + 1]
             
-            await db.issues.update_one(
+            issue_ops.append(UpdateOne(
                 {"issue_id": issue["issue_id"]},
                 {"$set": {"assigned_role": next_role, "status": "Escalated"}}
-            )
+            ))
             
             issue_update = IssueUpdate(
                 issue_id=issue["issue_id"],
                 role="System",
                 content_type="text",
-                content_text=f"Auto-escalated to {next_role} due to SLA breach"
+                content_text=f"Auto-escalated to {next_role} due to SLA breach",
+                timestamp=now
             )
-            await db.issue_updates.insert_one(issue_update.model_dump())
-            escalated_count += 1
+            update_docs.append(issue_update.model_dump())
     
-    return {"escalated_count": escalated_count}
+    # Apply all escalations in one round trip per collection
+    if issue_ops:
+        await db.issues.bulk_write(issue_ops, ordered=False)
+        await db.issue_updates.insert_many(update_docs, ordered=False)
+    
+    return {"escalated_count": len(issue_ops)}
 
 app.include_router(api_router)
 
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
-    allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
+    allow_origins=CORS_ORIGINS,
     allow_methods=["*"],
     allow_headers=["*"],
 )
@@ -487,6 +611,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def create_indexes():
+    await db.issues.create_index("issue_id", unique=True)
+    await db.issues.create_index("created_at")
+    await db.issues.create_index([("category", 1), ("status", 1)])
+    await db.issues.create_index([("status", 1), ("sla_deadline", 1)])
+    await db.issues.create_index("status")
+    await db.issues.create_index("anon_token")
+    await db.issues.create_index("assigned_role")
+    await db.issue_updates.create_index("issue_id")
+    await db.users.create_index("email", unique=True)
+    await db.users.create_index("uid", unique=True)
+
+@app.on_event("startup")
+async def start_hash_pool():
+    global hash_pool
+    hash_pool = ProcessPoolExecutor(
+        max_workers=HASH_WORKERS,
+        mp_context=multiprocessing.get_context("spawn")
+    )
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    client.close()
+
+@app.on_event("shutdown")
+async def shutdown_hash_pool():
+    if hash_pool:
+        hash_pool.shutdown(wait=False)
\ No newline at end of file